@@ -2,5 +2,5 @@
 # Author: Ahmad Alhour
 
 __package__ = "pycoolc"
-__all__ = ['lexer', 'parser', 'ast', 'semanter', 'pycoolc']
+__all__ = ['lexer', 'parser', 'ast', 'semanalyser', 'utils', 'pycoolc']
 
@@ -8,628 +8,611 @@
 # -----------------------------------------------------------------------------
 
 
+import re
+import sys
+from operator import attrgetter
+
+
+def _tuple_getter(fields):
+    """
+    Builds a callable that fetches the given attributes of a node as a tuple, in order. The callable is wrapped
+    in a staticmethod so that it can be stored as a class attribute and called as `self._getter(self)`.
+
+    :param fields: tuple of attribute names.
+    :return: staticmethod.
+    """
+    if not fields:
+        return staticmethod(lambda node: ())
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return staticmethod(lambda node: (getter(node),))
+    return staticmethod(getter)
+
+
+def _freeze(seq):
+    """
+    Converts a sequence of child nodes to a tuple, so that the parser can build lists incrementally and nodes
+    still always hold tuples. Tuples are returned as is.
+
+    :param seq: list or tuple.
+    :return: tuple.
+    """
+    return seq if isinstance(seq, tuple) else tuple(seq)
+
+
+def _make_to_tuple(clsname, fields):
+    """
+    Generates a to_tuple() method for a node class, whose body is a single tuple display reading each of the
+    fields directly, e.g. `return (("class_name", "Object"), ("name", self.name))`.
+
+    :param clsname: the name of the node class.
+    :param fields: tuple of attribute names.
+    :return: function.
+    """
+    pairs = "".join("({!r}, self.{}), ".format(field, field) for field in fields)
+    source = "def to_tuple(self):\n    return (('class_name', {!r}), {})\n".format(clsname, pairs)
+    namespace = {}
+    exec(source, namespace)
+    to_tuple = namespace["to_tuple"]
+    to_tuple.generated = True
+    return to_tuple
+
+
+def _make_render_steps(clsname, template):
+    """
+    Splits a node's readable template into the entries render() pushes on its stack for a node of that class, in
+    reverse order: literal text as (text, None) and fields as (index, conversion) pairs, where the conversion is
+    "s" or "r". The leading class name placeholder is folded into the first literal, e.g. "%s(expr=%s)" becomes
+    ((")", None), (0, "s"), ("IsVoid(expr=", None)).
+
+    :param clsname: the name of the node class.
+    :param template: a %-format string using only %s and %r placeholders, the first of which is the class name.
+    :return: tuple of pairs.
+    """
+    parts = re.split(r"%([sr])", template)
+    parts[0:3] = [parts[0] + clsname + parts[2]]
+    steps = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            steps.append((index // 2, part))
+        elif part:
+            steps.append((part, None))
+    return tuple(reversed(steps))
+
+
 # ############################## BASE AST NODES CLASSES ##############################
 
 
 class AST:
-    def __init__(self):
-        pass
-
-    @property
-    def clsname(self):
-        return str(self.__class__.__name__)
+    __slots__ = ()
+    _fields = ()
+    _getter = _tuple_getter(_fields)
+    _template = "%s"
+    clsname = "AST"
+    _render_steps = _make_render_steps(clsname, _template)
+    __match_args__ = _fields
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.clsname = sys.intern(cls.__name__)
+        cls._getter = _tuple_getter(cls._fields)
+        # Keep a to_tuple() defined by the class itself, or inherited from a base class that defines its own
+        inherited = cls.to_tuple
+        if "to_tuple" not in cls.__dict__ and (inherited is AST.to_tuple or getattr(inherited, "generated", False)):
+            cls.to_tuple = _make_to_tuple(cls.clsname, cls._fields)
+        cls._render_steps = _make_render_steps(cls.clsname, cls._template)
+        # Lets passes running on Python 3.10+ destructure nodes positionally, e.g. `case Addition(first, second):`
+        cls.__match_args__ = cls._fields
 
     def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname)
-        ])
+        return (("class_name", self.clsname), *zip(self._fields, self._getter(self)))
+
+    def iter_tuple(self):
+        """
+        Lazily yields the same (key, value) pairs as to_tuple(), for consumers that walk them only once. Classes that
+        override to_tuple() yield its pairs instead.
+        """
+        to_tuple = type(self).to_tuple
+        if to_tuple is not AST.to_tuple and not getattr(to_tuple, "generated", False):
+            yield from self.to_tuple()
+            return
+        yield "class_name", self.clsname
+        yield from zip(self._fields, self._getter(self))
 
     def to_readable(self):
-        return "{}".format(self.clsname)
-
-    def __repr__(self):
-        return self.__str__()
+        return self._template % (self.clsname, *self._getter(self))
 
     def __str__(self):
-        return str(self.to_readable())
+        return render(self)
+
+    __repr__ = __str__
 
 
 # ############################## PROGRAM, TYPE AND OBJECT ##############################
 
 
 class Program(AST):
-    def __init__(self, classes):
-        super(Program, self).__init__()
-        self.classes = classes
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname), 
-            ("classes", self.classes)
-        ])
+    _fields = ("classes",)
+    __slots__ = _fields
+    _template = "%s(classes=%s)"
 
-    def to_readable(self):
-        return "{}(classes={})".format(self.clsname, self.classes)
+    def __init__(self, classes):
+        self.classes = _freeze(classes)
 
 
 class Class(AST):
+    _fields = ("name", "parent", "features")
+    __slots__ = _fields
+    _template = "%s(name='%s', parent=%s, features=%s)"
+
     def __init__(self, name, parent, features):
-        super(Class, self).__init__()
         self.name = name
         self.parent = parent
-        self.features = features
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("name", self.name),
-            ("parent", self.parent), 
-            ("features", self.features)
-        ])
-
-    def to_readable(self):
-        return "{}(name='{}', parent={}, features={})".format(self.clsname, self.name, self.parent, self.features)
+        self.features = _freeze(features)
 
 
 class ClassFeature(AST):
-    def __init__(self):
-        super(ClassFeature, self).__init__()
+    __slots__ = ()
 
 
 class ClassMethod(ClassFeature):
+    _fields = ("name", "formal_params", "return_type", "body")
+    __slots__ = _fields
+    _template = "%s(name='%s', formal_params=%s, return_type=%s, body=%s)"
+
     def __init__(self, name, formal_params, return_type, body):
-        super(ClassMethod, self).__init__()
         self.name = name
-        self.formal_params = formal_params
+        self.formal_params = _freeze(formal_params)
         self.return_type = return_type
         self.body = body
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("name", self.name),
-            ("formal_params", self.formal_params),
-            ("return_type", self.return_type),
-            ("body", self.body)
-        ])
-
-    def to_readable(self):
-        return "{}(name='{}', formal_params={}, return_type={}, body={})".format(
-            self.clsname, self.name, self.formal_params, self.return_type, self.body)
-
 
 class ClassAttribute(ClassFeature):
+    _fields = ("name", "attr_type", "init_expr")
+    __slots__ = _fields
+    _template = "%s(name='%s', attr_type=%s, init_expr=%s)"
+
     def __init__(self, name, attr_type, init_expr):
-        super(ClassAttribute, self).__init__()
         self.name = name
         self.attr_type = attr_type
         self.init_expr = init_expr
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("name", self.name),
-            ("attr_type", self.attr_type),
-            ("init_expr", self.init_expr)  
-        ])
-
-    def to_readable(self):
-        return "{}(name='{}', attr_type={}, init_expr={})".format(
-            self.clsname, self.name, self.attr_type, self.init_expr)
-
 
 class FormalParameter(ClassFeature):
+    _fields = ("name", "param_type")
+    __slots__ = _fields
+    _template = "%s(name='%s', param_type=%s)"
+
     def __init__(self, name, param_type):
-        super(FormalParameter, self).__init__()
         self.name = name
         self.param_type = param_type
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("name", self.name),
-            ("param_type", self.param_type)
-        ])
-
-    def to_readable(self):
-        return "{}(name='{}', param_type={})".format(self.clsname, self.name, self.param_type)
-
 
 class Object(AST):
+    _fields = ("name",)
+    __slots__ = _fields
+    _template = "%s(name='%s')"
+
     def __init__(self, name):
-        super(Object, self).__init__()
         self.name = name
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("name", self.name)
-        ])
-
-    def to_readable(self):
-        return "{}(name='{}')".format(self.clsname, self.name)
-
 
 class Self(Object):
-    def __init__(self):
-        super(Self, self).__init__("SELF")
+    __slots__ = ()
+    _fields = ()
+    _template = "%s"
+    _instance = None
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname)
-        ])
+    def __new__(cls):
+        # Self carries no state of its own, so every occurrence of `self` in a program shares one instance.
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
 
-    def to_readable(self):
-        return "{}".format(self.clsname)
+    def __init__(self):
+        super().__init__("SELF")
 
 
 # ############################## CONSTANTS ##############################
 
 
 class Constant(AST):
-    def __init__(self):
-        super(Constant, self).__init__()
+    __slots__ = ()
+    # Shared literal nodes, keyed by node class and content
+    _shared = {}
+
+    def __new__(cls, content):
+        # Some literals recur all over programs, share one node for each of the contents the class' _is_shared()
+        # accepts. The content of a shared node is only set when it is created, never by later constructions.
+        shared = cls._is_shared(content)
+        node = Constant._shared.get((cls, content)) if shared else None
+        if node is None:
+            node = super().__new__(cls)
+            node.content = content
+            if shared:
+                Constant._shared[cls, content] = node
+        return node
+
+    def __getnewargs__(self):
+        return (self.content,)
+
+    @staticmethod
+    def _is_shared(content):
+        return False
 
 
 class Integer(Constant):
-    def __init__(self, content):
-        super(Integer, self).__init__()
-        self.content = content
+    _fields = ("content",)
+    __slots__ = _fields
+    _template = "%s(content=%s)"
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("content", self.content)
-        ])
-
-    def to_readable(self):
-        return "{}(content={})".format(self.clsname, self.content)
+    @staticmethod
+    def _is_shared(content):
+        # Small ints, like CPython does; only exact ints so that e.g. Integer(True) gets a node of its own
+        return type(content) is int and -5 <= content <= 256
 
 
 class String(Constant):
-    def __init__(self, content):
-        super(String, self).__init__()
-        self.content = content
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("content", self.content)
-        ])
-
-    def to_readable(self):
-        return "{}(content={})".format(self.clsname, repr(self.content))
+    _fields = ("content",)
+    __slots__ = _fields
+    _template = "%s(content=%r)"
 
 
 class Boolean(Constant):
-    def __init__(self, content):
-        super(Boolean, self).__init__()
-        self.content = content
+    _fields = ("content",)
+    __slots__ = _fields
+    _template = "%s(content=%s)"
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("content", self.content)
-        ])
+    @staticmethod
+    def _is_shared(content):
+        # There are only two boolean literals; only exact bools so that e.g. Boolean(1) gets a node of its own
+        return type(content) is bool
 
-    def to_readable(self):
-        return "{}(content={})".format(self.clsname, self.content)
+
+# Shared nodes for `self` and the boolean literals, which the parser uses directly instead of constructing them.
+SELF = Self()
+TRUE = Boolean(True)
+FALSE = Boolean(False)
 
 
 # ############################## EXPRESSIONS ##############################
 
 
 class Expr(AST):
-    def __init__(self):
-        super(Expr, self).__init__()
+    __slots__ = ()
 
 
 class NewObject(Expr):
+    _fields = ("type",)
+    __slots__ = _fields
+    _template = "%s(type=%s)"
+
     def __init__(self, new_type):
-        super(NewObject, self).__init__()
         self.type = new_type
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("type", self.type)
-        ])
-
-    def to_readable(self):
-        return "{}(type={})".format(self.clsname, self.type)
-
 
 class IsVoid(Expr):
+    _fields = ("expr",)
+    __slots__ = _fields
+    _template = "%s(expr=%s)"
+
     def __init__(self, expr):
-        super(IsVoid, self).__init__()
         self.expr = expr
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("expr", self.expr)
-        ])
-
-    def to_readable(self):
-        return "{}(expr={})".format(self.clsname, self.expr)
-
 
 class Assignment(Expr):
+    _fields = ("instance", "expr")
+    __slots__ = _fields
+    _template = "%s(instance=%s, expr=%s)"
+
     def __init__(self, instance, expr):
-        super(Assignment, self).__init__()
         self.instance = instance
         self.expr = expr
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("instance", self.instance),
-            ("expr", self.expr)
-        ])
-
-    def to_readable(self):
-        return "{}(instance={}, expr={})".format(self.clsname, self.instance, self.expr)
-
 
 class Block(Expr):
-    def __init__(self, expr_list):
-        super(Block, self).__init__()
-        self.expr_list = expr_list
+    _fields = ("expr_list",)
+    __slots__ = _fields
+    _template = "%s(expr_list=%s)"
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("expr_list", self.expr_list)
-        ])
-
-    def to_readable(self):
-        return "{}(expr_list={})".format(self.clsname, self.expr_list)
+    def __init__(self, expr_list):
+        self.expr_list = _freeze(expr_list)
 
 
 class DynamicDispatch(Expr):
-    def __init__(self, instance, method, arguments):
-        super(DynamicDispatch, self).__init__()
+    _fields = ("instance", "method", "arguments")
+    __slots__ = _fields
+    _template = "%s(instance=%s, method=%s, arguments=%s)"
+
+    def __init__(self, instance, method, arguments=()):
         self.instance = instance
         self.method = method
-        self.arguments = arguments if arguments is not None else tuple()
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("instance", self.instance),
-            ("method", self.method),
-            ("arguments", self.arguments)
-        ])
-
-    def to_readable(self):
-        return "{}(instance={}, method={}, arguments={})".format(
-            self.clsname, self.instance, self.method, self.arguments)
+        self.arguments = _freeze(arguments)
 
 
 class StaticDispatch(Expr):
-    def __init__(self, instance, dispatch_type, method, arguments):
-        super(StaticDispatch, self).__init__()
+    _fields = ("instance", "dispatch_type", "method", "arguments")
+    __slots__ = _fields
+    _template = "%s(instance=%s, dispatch_type=%s, method=%s, arguments=%s)"
+
+    def __init__(self, instance, dispatch_type, method, arguments=()):
         self.instance = instance
         self.dispatch_type = dispatch_type
         self.method = method
-        self.arguments = arguments if arguments is not None else tuple()
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("instance", self.instance),
-            ("dispatch_type", self.dispatch_type),
-            ("method", self.method),
-            ("arguments", self.arguments)
-        ])
-
-    def to_readable(self):
-        return "{}(instance={}, dispatch_type={}, method={}, arguments={})".format(
-            self.clsname, self.instance, self.dispatch_type, self.method, self.arguments)
+        self.arguments = _freeze(arguments)
 
 
 class Let(Expr):
+    _fields = ("instance", "return_type", "init_expr", "body")
+    __slots__ = _fields
+    _template = "%s(instance=%s, return_type=%s, init_expr=%s, body=%s)"
+
     def __init__(self, instance, return_type, init_expr, body):
-        super(Let, self).__init__()
         self.instance = instance
         self.return_type = return_type
         self.init_expr = init_expr
         self.body = body
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("instance", self.instance),
-            ("return_type", self.return_type),
-            ("init_expr", self.init_expr),
-            ("body", self.body)
-        ])
-
-    def to_readable(self):
-        return "{}(instance={}, return_type={}, init_expr={}, body={})".format(
-            self.clsname, self.instance, self.return_type, self.init_expr, self.body)
-
 
 class If(Expr):
+    _fields = ("predicate", "then_body", "else_body")
+    __slots__ = _fields
+    _template = "%s(predicate=%s, then_body=%s, else_body=%s)"
+
     def __init__(self, predicate, then_body, else_body):
-        super(If, self).__init__()
         self.predicate = predicate
         self.then_body = then_body
         self.else_body = else_body
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("predicate", self.predicate),
-            ("then_body", self.then_body),
-            ("else_body", self.else_body)
-        ])
-
-    def to_readable(self):
-        return "{}(predicate={}, then_body={}, else_body={})".format(
-            self.clsname, self.predicate, self.then_body, self.else_body)
-
 
 class WhileLoop(Expr):
+    _fields = ("predicate", "body")
+    __slots__ = _fields
+    _template = "%s(predicate=%s, body=%s)"
+
     def __init__(self, predicate, body):
-        super(WhileLoop, self).__init__()
         self.predicate = predicate
         self.body = body
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("predicate", self.predicate),
-            ("body", self.body)
-        ])
-
-    def to_readable(self):
-        return "{}(predicate={}, body={})".format(self.clsname, self.predicate, self.body)
-
 
 class Case(Expr):
+    _fields = ("expr", "actions")
+    __slots__ = _fields
+    _template = "%s(expr=%s, actions=%s)"
+
     def __init__(self, expr, actions):
-        super(Case, self).__init__()
         self.expr = expr
-        self.actions = actions
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("expr", self.expr),
-            ("actions", self.actions)
-        ])
-
-    def to_readable(self):
-        return "{}(expr={}, actions={})".format(self.clsname, self.expr, self.actions)
+        self.actions = _freeze(actions)
 
 
 class Action(AST):
+    _fields = ("name", "action_type", "body")
+    __slots__ = _fields
+    _template = "%s(name='%s', action_type=%s, body=%s)"
+
     def __init__(self, name, action_type, body):
-        super(Action, self).__init__()
         self.name = name
         self.action_type = action_type
         self.body = body
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("name", self.name),
-            ("action_type", self.action_type),
-            ("body", self.body)
-        ])
-
-    def to_readable(self):
-        return "{}(name='{}', action_type={}, body={})".format(self.clsname, self.name, self.action_type, self.body)
-
 
 # ############################## UNARY OPERATIONS ##################################
 
 
 class UnaryOperation(Expr):
-    def __init__(self):
-        super(UnaryOperation, self).__init__()
+    __slots__ = ()
 
 
 class IntegerComplement(UnaryOperation):
+    _fields = ("integer_expr",)
+    __slots__ = _fields
+    _template = "%s(expr=%s)"
+    symbol = "~"
+
     def __init__(self, integer_expr):
-        super(IntegerComplement, self).__init__()
-        self.symbol = "~"
         self.integer_expr = integer_expr
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("integer_expr", self.integer_expr)
-        ])
-
-    def to_readable(self):
-        return "{}(expr={})".format(self.clsname, self.integer_expr)
-
 
 class BooleanComplement(UnaryOperation):
+    _fields = ("boolean_expr",)
+    __slots__ = _fields
+    _template = "%s(expr=%s)"
+    symbol = "!"
+
     def __init__(self, boolean_expr):
-        super(BooleanComplement, self).__init__()
-        self.symbol = "!"
         self.boolean_expr = boolean_expr
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("boolean_expr", self.boolean_expr)
-        ])
-
-    def to_readable(self):
-        return "{}(expr={})".format(self.clsname, self.boolean_expr)
-
 
 # ############################## BINARY OPERATIONS ##################################
 
 
 class BinaryOperation(Expr):
-    def __init__(self):
-        super(BinaryOperation, self).__init__()
+    _fields = ("first", "second")
+    __slots__ = _fields
+    _template = "%s(first=%s, second=%s)"
 
-class Addition(BinaryOperation):
     def __init__(self, first, second):
-        super(Addition, self).__init__()
-        self.symbol = "+"
         self.first = first
         self.second = second
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("first", self.first),
-            ("second", self.second)
-        ])
 
-    def to_readable(self):
-        return "{}(first={}, second={})".format(self.clsname, self.first, self.second)
+class Addition(BinaryOperation):
+    __slots__ = ()
+    symbol = "+"
 
 
 class Subtraction(BinaryOperation):
-    def __init__(self, first, second):
-        super(Subtraction, self).__init__()
-        self.symbol = "-"
-        self.first = first
-        self.second = second
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("first", self.first),
-            ("second", self.second)
-        ])
-
-    def to_readable(self):
-        return "{}(first={}, second={})".format(self.clsname, self.first, self.second)
+    __slots__ = ()
+    symbol = "-"
 
 
 class Multiplication(BinaryOperation):
-    def __init__(self, first, second):
-        super(Multiplication, self).__init__()
-        self.symbol = "*"
-        self.first = first
-        self.second = second
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("first", self.first),
-            ("second", self.second)
-        ])
-
-    def to_readable(self):
-        return "{}(first={}, second={})".format(self.clsname, self.first, self.second)
+    __slots__ = ()
+    symbol = "*"
 
 
 class Division(BinaryOperation):
-    def __init__(self, first, second):
-        super(Division, self).__init__()
-        self.symbol = "/"
-        self.first = first
-        self.second = second
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("first", self.first),
-            ("second", self.second)
-        ])
-
-    def to_readable(self):
-        return "{}(first={}, second={})".format(self.clsname, self.first, self.second)
+    __slots__ = ()
+    symbol = "/"
 
 
 class Equal(BinaryOperation):
-    def __init__(self, first, second):
-        super(Equal, self).__init__()
-        self.symbol = "="
-        self.first = first
-        self.second = second
-
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("first", self.first),
-            ("second", self.second)
-        ])
-
-    def to_readable(self):
-        return "{}(first={}, second={})".format(self.clsname, self.first, self.second)
+    __slots__ = ()
+    symbol = "="
 
 
 class LessThan(BinaryOperation):
-    def __init__(self, first, second):
-        super(LessThan, self).__init__()
-        self.symbol = "<"
-        self.first = first
-        self.second = second
+    __slots__ = ()
+    symbol = "<"
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("first", self.first),
-            ("second", self.second)
-        ])
 
-    def to_readable(self):
-        return "{}(first={}, second={})".format(self.clsname, self.first, self.second)
+class LessThanOrEqual(BinaryOperation):
+    __slots__ = ()
+    symbol = "<="
+
+
+# ############################## VISITORS ##################################
+
+
+class NodeVisitor:
+    """
+    Base class for walking an AST. Subclasses define visit_<ClassName> methods, e.g. `visit_Addition`, which are
+    called for the nodes of that class; nodes without such a method are handed to generic_visit(), which visits
+    the nodes found in their fields. The visit_* methods are collected into a dispatch table once per visitor
+    class, so visiting a node is a single dict lookup on its class name.
+    """
+    _dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {
+            name[len("visit_"):]: method
+            for klass in reversed(cls.__mro__)
+            for name, method in vars(klass).items()
+            if name.startswith("visit_")
+        }
+
+    def visit(self, node):
+        method = self._dispatch.get(node.clsname)
+        if method is None:
+            return self.generic_visit(node)
+        return method(self, node)
+
+    def generic_visit(self, node):
+        for value in node._getter(node):
+            self._visit_value(value)
+
+    def _visit_value(self, value):
+        if isinstance(value, AST):
+            self.visit(value)
+        elif isinstance(value, (list, tuple)):
+            # Lists of nodes, and nested tuples such as the (name, type, body) actions of a Case expression
+            for item in value:
+                self._visit_value(item)
 
 
-class LessThanOrEqual(BinaryOperation):
-    def __init__(self, first, second):
-        super(LessThanOrEqual, self).__init__()
-        self.symbol = "<="
-        self.first = first
-        self.second = second
+# ############################## HELPER METHODS ##############################
 
-    def to_tuple(self):
-        return tuple([
-            ("class_name", self.clsname),
-            ("first", self.first),
-            ("second", self.second)
-        ])
 
-    def to_readable(self):
-        return "{}(first={}, second={})".format(self.clsname, self.first, self.second)
+# Maps the token names of operations to their symbols.
+_OP_MAP = {
+    "PLUS": "+",
+    "MINUS": "-",
+    "TIMES": "*",
+    "DIVIDE": "/",
+    "LTHAN": "<",
+    "LTEQ": "<=",
+    "EQUALS": "=",
+    "NOT": "not",
+    "INT_COMP": "~",
+}
 
+_UNARY_OPS = frozenset(("~", "not"))
 
-# ############################## HELPER METHODS ##############################
+_BINARY_OPS = frozenset(("+", "-", "*", "/", "<", "<=", "="))
 
 
 def is_valid_unary_operation(operation):
-    return operation in ["~", "not"]
+    return operation in _UNARY_OPS
 
 
 def is_valid_binary_operation(operation):
-    return operation in ["+", "-", "*", "/", "<", "<=", "="]
+    return operation in _BINARY_OPS
 
 
 def get_operation(operation):
     if operation is None or not isinstance(operation, str):
         return None
 
-    operation = operation.upper()
-    if operation == "PLUS":
-        return "+"
-    elif operation == "MINUS":
-        return "-"
-    elif operation == "TIMES":
-        return "*"
-    elif operation == "DIVIDE":
-        return "/"
-    elif operation == "LTHAN":
-        return "<"
-    elif operation == "LTEQ":
-        return "<="
-    elif operation == "EQUALS":
-        return "="
-    elif operation == "NOT":
-        return "not"
-    elif operation == "INT_COMP":
-        return "~"
-    else:
-        return None
-
+    # Token names coming from the lexer are already upper-case, only fall back to upper() for other spellings.
+    symbol = _OP_MAP.get(operation)
+    if symbol is None:
+        symbol = _OP_MAP.get(operation.upper())
+    return symbol
+
+
+def render(node):
+    """
+    Renders a node exactly like str() would, i.e. as its to_readable() with all nested nodes, lists and tuples
+    rendered in place, but walks the tree with an explicit stack instead of recursing through the __str__ of
+    every child. Deeply nested programs therefore can't hit the interpreter's recursion limit. Nodes without
+    nested nodes, lists or tuples, and nodes of classes that override to_readable(), are rendered directly.
+
+    :param node: an AST node, or any value found in a node's fields.
+    :return: string.
+    """
+    parts = []
+    # Each entry is a (value, conversion) pair: conversion is "s" or "r" for values to render, or None for
+    # literal text which is emitted as is.
+    stack = [(node, "s")]
+    while stack:
+        value, conversion = stack.pop()
+        if conversion is None:
+            parts.append(value)
+        elif isinstance(value, AST):
+            if type(value).to_readable is not AST.to_readable:
+                parts.append(value.to_readable())
+                continue
+            values = value._getter(value)
+            for field in values:
+                if isinstance(field, AST) or type(field) in (list, tuple):
+                    break
+            else:
+                parts.append(value._template % (value.clsname, *values))
+                continue
+            for item, conversion in value._render_steps:
+                stack.append((item, None) if conversion is None else (values[item], conversion))
+        elif type(value) in (list, tuple):
+            # Same output as list.__repr__ and tuple.__repr__, which render their items with repr()
+            opening, closing = ("[", "]") if type(value) is list else ("(", ",)" if len(value) == 1 else ")")
+            stack.append((closing, None))
+            for index in range(len(value) - 1, -1, -1):
+                stack.append((value[index], "r"))
+                if index:
+                    stack.append((", ", None))
+            stack.append((opening, None))
+        else:
+            parts.append(str(value) if conversion == "s" else repr(value))
+    return "".join(parts)
+
+
+def walk(node):
+    """
+    Yields the given node and all nodes below it in pre-order, including nodes nested in lists and tuples such as
+    the (name, type, body) actions of a Case expression. The tree is walked with an explicit stack, so passes
+    that only need to see every node can use a plain loop instead of recursing.
+
+    :param node: an AST node.
+    :return: generator of AST nodes.
+    """
+    stack = [node]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, AST):
+            yield value
+            children = value._getter(value)
+        elif isinstance(value, (list, tuple)):
+            children = value
+        else:
+            continue
+        stack.extend(reversed(children))
@@ -8,10 +8,126 @@
 # Description:  The Lexer module. Implements lexical analysis of COOL programs.
 # -----------------------------------------------------------------------------
 
+import hashlib
+import importlib
+import importlib.util
+import os
+import re
+import sys
+from types import MappingProxyType
+
 import ply.lex as lex
 from ply.lex import TOKEN
 
 
+# -----------------------------------------------------------------------------
+#
+#                GLOBALS AND CONSTANTS
+#
+# -----------------------------------------------------------------------------
+
+# Collection of COOL Syntax Tokens.
+TOKENS_COLLECTION = (
+    # Identifiers
+    "ID", "TYPE",
+
+    # Primitive Types
+    "INTEGER", "STRING", "BOOLEAN",
+
+    # Literals
+    "LPAREN", "RPAREN", "LBRACE", "RBRACE", "COLON", "COMMA", "DOT", "SEMICOLON", "AT",
+
+    # Operators
+    "PLUS", "MINUS", "MULTIPLY", "DIVIDE", "EQ", "LT", "LTEQ", "ASSIGN", "INT_COMP", "NOT",
+
+    # Special Operators
+    "ARROW"
+)
+
+# Map of Basic-COOL reserved keywords.
+BASIC_RESERVED = MappingProxyType({
+    "case": "CASE",
+    "class": "CLASS",
+    "else": "ELSE",
+    "esac": "ESAC",
+    "fi": "FI",
+    "if": "IF",
+    "in": "IN",
+    "inherits": "INHERITS",
+    "isvoid": "ISVOID",
+    "let": "LET",
+    "loop": "LOOP",
+    "new": "NEW",
+    "of": "OF",
+    "pool": "POOL",
+    "self": "SELF",
+    "then": "THEN",
+    "while": "WHILE"
+})
+
+# Map of Extended-COOL reserved keywords.
+EXTENDED_RESERVED = MappingProxyType({
+    "abstract": "ABSTRACT",
+    "catch": "CATCH",
+    "do": "DO",
+    "def": "DEF",
+    "final": "FINAL",
+    "finally": "FINALLY",
+    "for": "FOR",
+    "forSome": "FORSOME",
+    "explicit": "IMPLICIT",
+    "implicit": "IMPORT",
+    "lazy": "LAZY",
+    "match": "MATCH",
+    "native": "NATIVE",
+    "null": "NULL",
+    "object": "OBJECT",
+    "override": "OVERRIDE",
+    "package": "PACKAGE",
+    "private": "PRIVATE",
+    "protected": "PROTECTED",
+    "requires": "REQUIRES",
+    "return": "RETURN",
+    "sealed": "SEALED",
+    "super": "SUPER",
+    "this": "THIS",
+    "throw": "THROW",
+    "trait": "TRAIT",
+    "try": "TRY",
+    "type": "TYPE",
+    "val": "VAL",
+    "var": "VAR",
+    "with": "WITH",
+    "yield": "YIELD"
+})
+
+# Map of string escape sequences (the character following a backslash) to the characters they stand for.
+STRING_ESCAPES = MappingProxyType({
+    "b": "\b",
+    "t": "\t",
+    "n": "\n",
+    "f": "\f",
+    "\\": "\\"
+})
+
+# Map of the built-in types.
+BUILTIN_TYPES = MappingProxyType({
+    "Bool": "BOOL_TYPE",
+    "Int": "INT_TYPE",
+    "IO": "IO_TYPE",
+    "Main": "MAIN_TYPE",
+    "Object": "OBJECT_TYPE",
+    "String": "STRING_TYPE",
+    "SELF_TYPE": "SELF_TYPE"
+})
+
+# Name of the lextab module the lexer generates by default.
+DEFAULT_LEXTAB = "pycoolc.lextab"
+
+# Signature of the rules a lextab module was generated from, as stamped on it by the lexer.
+LEXTAB_SIGNATURE = re.compile(r"^_lexsignature = '(\w+)'$", re.MULTILINE)
+
+
 class PyCoolLexer(object):
     """
     PyCoolLexer class.
@@ -38,16 +154,18 @@ class PyCoolLexer(object):
     def __init__(self,
                  build_lexer=True,
                  debug=False,
-                 lextab="pycoolc.lextab",
+                 lextab=DEFAULT_LEXTAB,
                  optimize=True,
-                 outputdir="",
+                 outputdir=None,
                  debuglog=None,
                  errorlog=None):
         """
         Initializer.
         :param debug: Debug mode flag.
         :param optimize: Optimize mode flag.
-        :param outputdir: Output directory of lexing output; by default the .out file goes in the same directory.
+        :param outputdir: Output directory of lexing output; by default the lextab module is written to the package
+         directory of lextab (pycoolc/), from where optimized builds reload it instead of rebuilding the lexer as long
+         as it was generated from the current rules.
         :param debuglog: Debug log file path; by default lexer prints to stderr.
         :param errorlog: Error log file path; by default lexer print to stderr.
         :param build_lexer: If this is set to True the internal lexer will be built right after initialization,
@@ -83,111 +201,12 @@ class PyCoolLexer(object):
 
     # #################################  READONLY  #####################################
 
-    @property
-    def tokens_collection(self):
-        """
-        Collection of COOL Syntax Tokens.
-        :return: Tuple.
-        """
-        return (
-            # Identifiers
-            "ID", "TYPE",
-
-            # Primitive Types
-            "INTEGER", "STRING", "BOOLEAN",
-
-            # Literals
-            "LPAREN", "RPAREN", "LBRACE", "RBRACE", "COLON", "COMMA", "DOT", "SEMICOLON", "AT",
-
-            # Operators
-            "PLUS", "MINUS", "MULTIPLY", "DIVIDE", "EQ", "LT", "LTEQ", "ASSIGN", "INT_COMP", "NOT",
-
-            # Special Operators
-            "ARROW"
-        )
-
-    @property
-    def basic_reserved(self):
-        """
-        Map of Basic-COOL reserved keywords.
-        :return: dict.
-        """
-        return {
-            "case": "CASE",
-            "class": "CLASS",
-            "else": "ELSE",
-            "esac": "ESAC",
-            "fi": "FI",
-            "if": "IF",
-            "in": "IN",
-            "inherits": "INHERITS",
-            "isvoid": "ISVOID",
-            "let": "LET",
-            "loop": "LOOP",
-            "new": "NEW",
-            "of": "OF",
-            "pool": "POOL",
-            "self": "SELF",
-            "then": "THEN",
-            "while": "WHILE"
-        }
-
-    @property
-    def extended_reserved(self):
-        """
-        Map of Extended-COOL reserved keywords.
-        :return: dict.
-        """
-        return {
-            "abstract": "ABSTRACT",
-            "catch": "CATCH",
-            "do": "DO",
-            "def": "DEF",
-            "final": "FINAL",
-            "finally": "FINALLY",
-            "for": "FOR",
-            "forSome": "FORSOME",
-            "explicit": "IMPLICIT",
-            "implicit": "IMPORT",
-            "lazy": "LAZY",
-            "match": "MATCH",
-            "native": "NATIVE",
-            "null": "NULL",
-            "object": "OBJECT",
-            "override": "OVERRIDE",
-            "package": "PACKAGE",
-            "private": "PRIVATE",
-            "protected": "PROTECTED",
-            "requires": "REQUIRES",
-            "return": "RETURN",
-            "sealed": "SEALED",
-            "super": "SUPER",
-            "this": "THIS",
-            "throw": "THROW",
-            "trait": "TRAIT",
-            "try": "TRY",
-            "type": "TYPE",
-            "val": "VAL",
-            "var": "VAR",
-            "with": "WITH",
-            "yield": "YIELD"
-        }
-
-    @property
-    def builtin_types(self):
-        """
-        A map of the built-in types.
-        :return dict
-        """
-        return {
-            "Bool": "BOOL_TYPE",
-            "Int": "INT_TYPE",
-            "IO": "IO_TYPE",
-            "Main": "MAIN_TYPE",
-            "Object": "OBJECT_TYPE",
-            "String": "STRING_TYPE",
-            "SELF_TYPE": "SELF_TYPE"
-        }
+    # The token and keyword tables are module-level constants, built once at import time rather than on every
+    # access, since t_ID consults the reserved keywords map for every identifier it matches.
+    tokens_collection = TOKENS_COLLECTION
+    basic_reserved = BASIC_RESERVED
+    extended_reserved = EXTENDED_RESERVED
+    builtin_types = BUILTIN_TYPES
 
     # ################################  PRIVATE  #######################################
 
@@ -216,15 +235,26 @@ class PyCoolLexer(object):
     t_EQ = r'\='            # =
     t_LTEQ = r'\<\='        # <=
     t_ASSIGN = r'\<\-'      # <-
-    t_NOT = r'not'          # not
     t_ARROW = r'\=\>'       # =>
 
-    @TOKEN(r"(true|false)")
+    # Type names start with an upper case letter and can never be one of the (lower case) reserved keywords, so unlike
+    # identifiers they need no keyword lookup and are matched by a plain string rule, with no Python callback.
+    t_TYPE = r"[A-Z][a-zA-Z_0-9]*"
+
+    @TOKEN(r"not\b")
+    def t_NOT(self, token):
+        """
+        The Boolean Complement Operator Token Rule. Declared as a function so it is tried before t_ID, which would
+        otherwise match "not" as an identifier.
+        """
+        return token
+
+    @TOKEN(r"(true|false)\b")
     def t_BOOLEAN(self, token):
         """
         The Bool Primitive Type Token Rule.
         """
-        token.value = True if token.value == "true" else False
+        token.value = token.value == "true"
         return token
 
     @TOKEN(r"\d+")
@@ -235,29 +265,23 @@ class PyCoolLexer(object):
         token.value = int(token.value)
         return token
 
-    @TOKEN(r"[A-Z][a-zA-Z_0-9]*")
-    def t_TYPE(self, token):
-        """
-        The Type Token Rule.
-        """
-        token.type = self.basic_reserved.get(token.value, 'TYPE')
-        return token
-
     @TOKEN(r"[a-z_][a-zA-Z_0-9]*")
     def t_ID(self, token):
         """
         The Identifier Token Rule.
         """
         # Check for reserved words
-        token.type = self.basic_reserved.get(token.value, 'ID')
+        token.type = BASIC_RESERVED.get(token.value, 'ID')
+        token.value = sys.intern(token.value)
         return token
 
-    @TOKEN(r"\n+")
+    @TOKEN(r"\n[\n \t\r\f]*")
     def t_newline(self, token):
         """
-        The Newline Token Rule.
+        The Newline Token Rule. Also consumes the indentation and blank lines following the newline, so that a line
+        break plus the next line's leading whitespace costs one rule call.
         """
-        token.lexer.lineno += len(token.value)
+        token.lexer.lineno += token.value.count("\n")
 
     # Ignore Whitespace Character Rule
     t_ignore = ' \t\r\f'
@@ -300,21 +324,23 @@ class PyCoolLexer(object):
             token.lexer.stringbuf += '"'
             token.lexer.string_backslashed = False
 
+    @TOKEN(r"[^\n\"\\]+")
+    def t_STRING_text(self, token):
+        """
+        Appends a whole run of plain string characters at once, instead of dispatching one token per character. If
+        the run follows a backslash, its first character is the escaped one.
+        """
+        if token.lexer.string_backslashed:
+            escaped = token.value[0]
+            token.lexer.stringbuf += STRING_ESCAPES.get(escaped, escaped) + token.value[1:]
+            token.lexer.string_backslashed = False
+        else:
+            token.lexer.stringbuf += token.value
+
     @TOKEN(r"[^\n]")
     def t_STRING_anything(self, token):
         if token.lexer.string_backslashed:
-            if token.value == 'b':
-                token.lexer.stringbuf += '\b'
-            elif token.value == 't':
-                token.lexer.stringbuf += '\t'
-            elif token.value == 'n':
-                token.lexer.stringbuf += '\n'
-            elif token.value == 'f':
-                token.lexer.stringbuf += '\f'
-            elif token.value == '\\':
-                token.lexer.stringbuf += '\\'
-            else:
-                token.lexer.stringbuf += token.value
+            token.lexer.stringbuf += STRING_ESCAPES.get(token.value, token.value)
             token.lexer.string_backslashed = False
         else:
             if token.value != '\\':
@@ -348,6 +374,9 @@ class PyCoolLexer(object):
         else:
             token.lexer.comment_count -= 1
 
+    # Skip runs of comment text in a single match; only "(" and "*" need to be looked at one at a time
+    t_COMMENT_ignore_TEXT = r"[^(*]+"
+
     # COMMENT ignored characters
     t_COMMENT_ignore = ''
 
@@ -364,6 +393,73 @@ class PyCoolLexer(object):
 
     # ################# END OF LEXICAL ANALYSIS RULES DECLARATION ######################
 
+    def _rules_signature(self):
+        """
+        Computes a digest of everything ply.lex builds the lexing tables from: the tokens, the states and every
+        rule's name and regex (plus its line for function rules, since their order matters).
+        :return: hex digest string.
+        """
+        rules = [repr(self.tokens), repr(self.states)]
+        for name in sorted(dir(self)):
+            if not name.startswith("t_"):
+                continue
+            rule = getattr(self, name)
+            if callable(rule):
+                regex = getattr(rule, "regex", rule.__doc__)
+                rules.append("{} {} {}".format(name, rule.__code__.co_firstlineno, regex))
+            else:
+                rules.append("{} {!r}".format(name, rule))
+        return hashlib.sha1("\n".join(rules).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _signature_line(signature):
+        return "_lexsignature = {!r}\n".format(signature)
+
+    @staticmethod
+    def _find_lextab(lextab):
+        """
+        Finds the source file of the lextab module that ply.lex would import, and the rules signature stamped on it.
+        :param lextab: lextab module name.
+        :return: (path, signature) tuple; path is None if there is no such file and signature is None if the module
+         carries no signature.
+        """
+        try:
+            spec = importlib.util.find_spec(lextab)
+            if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+                return None, None
+            with open(spec.origin) as lextab_file:
+                match = LEXTAB_SIGNATURE.search(lextab_file.read())
+        except (ImportError, ValueError, OSError):
+            return None, None
+        return spec.origin, match and match.group(1)
+
+    def _write_lextab(self, lextab, outputdir, signature):
+        """
+        Writes the tables of the built lexer to the lextab module, stamped with the signature of the rules they were
+        generated from. The lexer works without its lextab, so a lextab that can't be written (e.g. in a read-only
+        install) is skipped.
+        :param lextab: lextab module name.
+        :param outputdir: the directory to write the lextab module to, None for the lextab package directory.
+        :param signature: signature of the current rules, see _rules_signature().
+        :return: None
+        """
+        package, _, module = lextab.rpartition(".")
+        try:
+            if outputdir is None:
+                outputdir = os.path.dirname(importlib.import_module(package).__file__ if package else __file__)
+            self.lexer.writetab(module, outputdir)
+            path = os.path.join(outputdir, module + ".py")
+            with open(path, "a") as lextab_file:
+                lextab_file.write(self._signature_line(signature))
+            # The bytecode of the previous lextab could otherwise pass for the new one's
+            cached = importlib.util.cache_from_source(path)
+            if os.path.isfile(cached):
+                os.remove(cached)
+        except (ImportError, OSError):
+            return
+        sys.modules.pop(lextab, None)
+        importlib.invalidate_caches()
+
     # #################################  PUBLIC  #######################################
 
     def build(self, **kwargs):
@@ -375,7 +471,7 @@ class PyCoolLexer(object):
             * optimize: Optimize mode flag.
             * debuglog: Debug log file path; by default lexer prints to stderr.
             * errorlog: Error log file path; by default lexer print to stderr.
-            * outputdir: Output directory of lexing output; by default the .out file goes in the same directory.
+            * outputdir: Output directory of lexing output; by default the lextab module goes in the pycoolc package.
         :return: None
         """
         # Parse the parameters
@@ -394,10 +490,24 @@ class PyCoolLexer(object):
         self.reserved = self.basic_reserved.keys()
         self.tokens = self.tokens_collection + tuple(self.basic_reserved.values())
 
+        # ply.lex loads an optimized lextab without checking it against the rules, so it is only let to read one that
+        # is stamped with the signature of the current rules. Otherwise the lexer is built from the rules, and the
+        # lextab is (re)generated unless it is a module this lexer did not generate.
+        regenerate = False
+        if optimize and isinstance(lextab, str):
+            signature = self._rules_signature()
+            path, stamped = self._find_lextab(lextab)
+            if stamped != signature:
+                optimize = False
+                regenerate = path is None or stamped is not None or lextab == DEFAULT_LEXTAB
+
         # Build internal ply.lex instance
         self.lexer = lex.lex(module=self, lextab=lextab, debug=debug, optimize=optimize, outputdir=outputdir,
                              debuglog=debuglog, errorlog=errorlog)
 
+        if regenerate:
+            self._write_lextab(lextab, outputdir, signature)
+
     def input(self, cool_program_source_code: str):
         """
         Run lexical analysis on a given COOL program source code string.
@@ -470,7 +580,8 @@ def make_lexer(**kwargs) -> PyCoolLexer:
     :return: PyCoolLexer object.
     """
     a_lexer = PyCoolLexer(**kwargs)
-    a_lexer.build()
+    if a_lexer.lexer is None:
+        a_lexer.build()
     return a_lexer
 
 
@@ -32,15 +32,17 @@ class PyCoolParser(object):
                  debug=False,
                  write_tables=True,
                  optimize=True,
-                 outputdir="",
+                 outputdir=None,
                  yacctab="pycoolc.yacctab",
                  debuglog=None,
                  errorlog=None):
         """
         Initializer.
         :param debug: Debug mode flag.
-        :param optimize: Optimize mode flag.
-        :param outputdir: Output directory of parser output; by default the .out file goes in the same directory.
+        :param optimize: Optimize mode flag of the lexer.
+        :param outputdir: Output directory of parser output; by default the yacctab module is written to the package
+         directory of yacctab (pycoolc/), from where later builds reload the parsing tables instead of regenerating them
+         as long as their signature matches the current grammar.
         :param debuglog: Debug log file path; by default parser prints to stderr.
         :param errorlog: Error log file path; by default parser print to stderr.
         :param build_parser: If this is set to True the internal parser will be built right after initialization,
@@ -107,9 +109,10 @@ class PyCoolParser(object):
                    | class SEMICOLON
         """
         if len(parse) == 3:
-            parse[0] = (parse[1],)
+            parse[0] = [parse[1]]
         else:
-            parse[0] = parse[1] + (parse[2],)
+            parse[1].append(parse[2])
+            parse[0] = parse[1]
 
     def p_class(self, parse):
         """
@@ -128,7 +131,7 @@ class PyCoolParser(object):
         features_list_opt : features_list
                           | empty
         """
-        parse[0] = tuple() if parse.slice[1].type == "empty" else parse[1]
+        parse[0] = () if parse.slice[1].type == "empty" else parse[1]
 
     def p_feature_list(self, parse):
         """
@@ -136,9 +139,10 @@ class PyCoolParser(object):
                       | feature SEMICOLON
         """
         if len(parse) == 3:
-            parse[0] = (parse[1],)
+            parse[0] = [parse[1]]
         else:
-            parse[0] = parse[1] + (parse[2],)
+            parse[1].append(parse[2])
+            parse[0] = parse[1]
 
     def p_feature_method(self, parse):
         """
@@ -150,7 +154,7 @@ class PyCoolParser(object):
         """
         feature : ID LPAREN RPAREN COLON TYPE LBRACE expression RBRACE
         """
-        parse[0] = AST.ClassMethod(name=parse[1], formal_params=tuple(), return_type=parse[5], body=parse[7])
+        parse[0] = AST.ClassMethod(name=parse[1], formal_params=(), return_type=parse[5], body=parse[7])
 
     def p_feature_attr_initialized(self, parse):
         """
@@ -170,9 +174,10 @@ class PyCoolParser(object):
                             | formal_param
         """
         if len(parse) == 2:
-            parse[0] = (parse[1],)
+            parse[0] = [parse[1]]
         else:
-            parse[0] = parse[1] + (parse[3],)
+            parse[1].append(parse[3])
+            parse[0] = parse[1]
 
     def p_formal(self, parse):
         """
@@ -196,7 +201,7 @@ class PyCoolParser(object):
         """
         expression : BOOLEAN
         """
-        parse[0] = AST.Boolean(content=parse[1])
+        parse[0] = AST.TRUE if parse[1] else AST.FALSE
 
     def p_expression_string_constant(self, parse):
         """
@@ -208,7 +213,7 @@ class PyCoolParser(object):
         """
         expression  : SELF
         """
-        parse[0] = AST.Self()
+        parse[0] = AST.SELF
 
     def p_expression_block(self, parse):
         """
@@ -222,9 +227,10 @@ class PyCoolParser(object):
                    | expression SEMICOLON
         """
         if len(parse) == 3:
-            parse[0] = (parse[1],)
+            parse[0] = [parse[1]]
         else:
-            parse[0] = parse[1] + (parse[2],)
+            parse[1].append(parse[2])
+            parse[0] = parse[1]
 
     def p_expression_assignment(self, parse):
         """
@@ -245,7 +251,7 @@ class PyCoolParser(object):
         arguments_list_opt : arguments_list
                            | empty
         """
-        parse[0] = tuple() if parse.slice[1].type == "empty" else parse[1]
+        parse[0] = () if parse.slice[1].type == "empty" else parse[1]
 
     def p_arguments_list(self, parse):
         """
@@ -253,9 +259,10 @@ class PyCoolParser(object):
                        | expression
         """
         if len(parse) == 2:
-            parse[0] = (parse[1],)
+            parse[0] = [parse[1]]
         else:
-            parse[0] = parse[1] + (parse[3],)
+            parse[1].append(parse[3])
+            parse[0] = parse[1]
 
     def p_expression_static_dispatch(self, parse):
         """
@@ -267,7 +274,7 @@ class PyCoolParser(object):
         """
         expression : ID LPAREN arguments_list_opt RPAREN
         """
-        parse[0] = AST.DynamicDispatch(instance=AST.Self(), method=parse[1], arguments=parse[3])
+        parse[0] = AST.DynamicDispatch(instance=AST.SELF, method=parse[1], arguments=parse[3])
 
     # ######################### PARENTHESIZED, MATH & COMPARISONS #####################
 
@@ -370,9 +377,10 @@ class PyCoolParser(object):
                      | action
         """
         if len(parse) == 2:
-            parse[0] = (parse[1],)
+            parse[0] = [parse[1]]
         else:
-            parse[0] = parse[1] + (parse[2],)
+            parse[1].append(parse[2])
+            parse[0] = parse[1]
 
     def p_action_expr(self, parse):
         """
@@ -438,10 +446,10 @@ class PyCoolParser(object):
         current instance scope.
         :param kwargs: yaac.yaac() config parameters, complete list:
             * debug: Debug mode flag.
-            * optimize: Optimize mode flag.
+            * optimize: Optimize mode flag of the lexer.
             * debuglog: Debug log file path; by default parser prints to stderr.
             * errorlog: Error log file path; by default parser print to stderr.
-            * outputdir: Output directory of parsing output; by default the .out file goes in the same directory.
+            * outputdir: Output directory of parsing output; by default the yacctab module goes in the pycoolc package.
         :return: None
         """
         # Parse the parameters
@@ -465,8 +473,9 @@ class PyCoolParser(object):
         # Expose tokens collections to this instance scope
         self.tokens = self.lexer.tokens
 
-        # Build yacc parser
-        self.parser = yacc.yacc(module=self, write_tables=write_tables, debug=debug, optimize=optimize,
+        # Build yacc parser; optimize mode would make yacc reuse the yacctab without checking its signature against
+        # the grammar, so it is left off and stale parsing tables get regenerated
+        self.parser = yacc.yacc(module=self, write_tables=write_tables, debug=debug, optimize=False,
                                 outputdir=outputdir, tabmodule=yacctab, debuglog=debuglog, errorlog=errorlog)
 
     def parse(self, program_source_code: str) -> AST.Program:
@@ -495,7 +504,8 @@ def make_parser(**kwargs) -> PyCoolParser:
     :return: PyCoolParser object.
     """
     a_parser = PyCoolParser(**kwargs)
-    a_parser.build()
+    if a_parser.parser is None:
+        a_parser.build()
     return a_parser
 
 
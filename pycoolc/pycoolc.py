@@ -121,8 +121,8 @@ def main():
     args = arg_parser.parse_args()
     programs = args.cool_program
 
-    # Initialize the master program source code string.
-    cool_program_code = ""
+    # Collect the source code of every program, joined into the master program source code string once read.
+    cool_program_sources = []
     
     # Check all programs have the *.cl extension.
     for program in programs:
@@ -135,12 +135,14 @@ def main():
     for program in programs:
         try:
             with open(program, encoding="utf-8") as file:
-                cool_program_code += file.read()
+                cool_program_sources.append(file.read())
         except (IOError, FileNotFoundError):
             print("Error! File \"{0}\" was not found. Are you sure the file exists?".format(program))
         except Exception:
             print("An unexpected error occurred!")
 
+    cool_program_code = "".join(cool_program_sources)
+
     # If the user asked for the list of tokens, run lexical analysis
     if args.tokens:
         print("{bar}\r\n# Running Lexical Analysis...\r\n{bar}".format(
@@ -187,7 +187,7 @@ class PyCoolSemanticAnalyser(object):
         :param program_ast: TODO
         :return: None
         """
-        super(PyCoolSemanticAnalyser, self).__init__()
+        super().__init__()
         
         # Initialize the internal program ast instance.
         self._program_ast = None
@@ -257,52 +257,52 @@ class PyCoolSemanticAnalyser(object):
                                         format(type(program_ast)))
 
         # Object Class
-        object_class = AST.Class(name=OBJECT_CLASS, parent=None, features=[
+        object_class = AST.Class(name=OBJECT_CLASS, parent=None, features=(
             # Abort method: halts the program.
-            AST.ClassMethod(name="abort", formal_params=[], return_type="Object", body=None),
+            AST.ClassMethod(name="abort", formal_params=(), return_type="Object", body=None),
 
             # Copy method: copies the object.
-            AST.ClassMethod(name="copy", formal_params=[], return_type="SELF_TYPE", body=None),
+            AST.ClassMethod(name="copy", formal_params=(), return_type="SELF_TYPE", body=None),
 
             # type_name method: returns a string representation of the class name.
-            AST.ClassMethod(name="type_name", formal_params=[], return_type="String", body=None)
-        ])
+            AST.ClassMethod(name="type_name", formal_params=(), return_type="String", body=None),
+        ))
 
         # IO Class
-        io_class = AST.Class(name=IO_CLASS, parent="Object", features=[
+        io_class = AST.Class(name=IO_CLASS, parent="Object", features=(
             # in_int: reads an integer from stdio
-            AST.ClassMethod(name="in_int", formal_params=[], return_type="Int", body=None),
+            AST.ClassMethod(name="in_int", formal_params=(), return_type="Int", body=None),
 
             # in_string: reads a string from stdio
-            AST.ClassMethod(name="in_string", formal_params=[], return_type="String", body=None),
+            AST.ClassMethod(name="in_string", formal_params=(), return_type="String", body=None),
 
             # out_int: outputs an integer to stdio
             AST.ClassMethod(name="out_int",
-                            formal_params=[AST.FormalParameter("arg", "Int")],
+                            formal_params=(AST.FormalParameter("arg", "Int"),),
                             return_type="SELF_TYPE",
                             body=None),
 
             # out_string: outputs a string to stdio
             AST.ClassMethod(name="out_string",
-                            formal_params=[AST.FormalParameter("arg", "String")],
+                            formal_params=(AST.FormalParameter("arg", "String"),),
                             return_type="SELF_TYPE",
-                            body=None)
-        ])
+                            body=None),
+        ))
 
         # Int Class
-        int_class = AST.Class(name=INTEGER_CLASS, parent=object_class.name, features=[
+        int_class = AST.Class(name=INTEGER_CLASS, parent=object_class.name, features=(
             # _val attribute: integer un-boxed value
-            AST.ClassAttribute(name="_val", attr_type=UNBOXED_PRIMITIVE_VALUE_TYPE, init_expr=None)
-        ])
+            AST.ClassAttribute(name="_val", attr_type=UNBOXED_PRIMITIVE_VALUE_TYPE, init_expr=None),
+        ))
 
         # Bool Class
-        bool_class = AST.Class(name=BOOLEAN_CLASS, parent=object_class.name, features=[
+        bool_class = AST.Class(name=BOOLEAN_CLASS, parent=object_class.name, features=(
             # _val attribute: boolean un-boxed value
-            AST.ClassAttribute(name="_val", attr_type=UNBOXED_PRIMITIVE_VALUE_TYPE, init_expr=None)
-        ])
+            AST.ClassAttribute(name="_val", attr_type=UNBOXED_PRIMITIVE_VALUE_TYPE, init_expr=None),
+        ))
 
         # String Class
-        string_class = AST.Class(name=STRING_CLASS, parent=object_class.name, features=[
+        string_class = AST.Class(name=STRING_CLASS, parent=object_class.name, features=(
             # _val attribute: string length
             AST.ClassAttribute(name='_val', attr_type='Int', init_expr=None),
 
@@ -310,20 +310,20 @@ class PyCoolSemanticAnalyser(object):
             AST.ClassAttribute('_str_field', UNBOXED_PRIMITIVE_VALUE_TYPE, None),
 
             # length method: returns the string's length
-            AST.ClassMethod(name='length', formal_params=[], return_type='Int', body=None),
+            AST.ClassMethod(name='length', formal_params=(), return_type='Int', body=None),
 
             # concat method: concatenates this string with another
             AST.ClassMethod(name='concat',
-                            formal_params=[AST.FormalParameter('arg', 'String')],
+                            formal_params=(AST.FormalParameter('arg', 'String'),),
                             return_type='String',
                             body=None),
 
             # substr method: returns the substring between two integer indices
             AST.ClassMethod(name='substr',
-                            formal_params=[AST.FormalParameter('arg1', 'Int'), AST.FormalParameter('arg2', 'Int')],
+                            formal_params=(AST.FormalParameter('arg1', 'Int'), AST.FormalParameter('arg2', 'Int')),
                             return_type='String',
-                            body=None)
-        ])
+                            body=None),
+        ))
 
         # Built in classes collection
         builtin_classes = (object_class, io_class, int_class, bool_class, string_class)
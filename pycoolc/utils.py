@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+from itertools import chain
+
 from pycoolc.ast import AST, Self
 
 
@@ -40,14 +42,15 @@ def print_readable_ast(tree, level=0, inline=False):
     # BEGIN
     #
     if is_node(tree):
-        attrs = tree.to_tuple()
-        
-        # First attribute is always the class name
-        if len(attrs) <= 1:
+        # First attribute is always the class name, nodes without other attributes have nothing else to print
+        attrs = tree.iter_tuple()
+        next(attrs, None)
+        first = next(attrs, None)
+        if first is None:
             print(indent('{0}()'.format(tree.clsname), level, inline))
         else:
             print(indent('{0}('.format(tree.clsname), level, inline))
-            for key, value in attrs:
+            for key, value in chain((first,), attrs):
                 if key == "class_name":
                     continue
                 print(indent(key + '=', level + 1), end='')
@@ -31,6 +31,7 @@ setup(
         "Topic :: Software Development :: Compilers",
         "License :: OSI Approved :: MIT License"
     ],
+    python_requires='>=3.6',
     install_requires=['ply']
 )
 
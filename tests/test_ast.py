@@ -0,0 +1,141 @@
+import copy
+import os
+import pickle
+import unittest
+
+import pycoolc.ast as AST
+from pycoolc.parser import PyCoolParser
+
+
+class NamesCollector(AST.NodeVisitor):
+    def __init__(self):
+        self.names = []
+
+    def visit_Object(self, node):
+        self.names.append(node.name)
+
+
+class IntegersCollector(NamesCollector):
+    def __init__(self):
+        super().__init__()
+        self.integers = []
+
+    def visit_Integer(self, node):
+        self.integers.append(node.content)
+
+
+class TestNodeVisitor(unittest.TestCase):
+    def test_dispatches_on_class_name(self):
+        visitor = IntegersCollector()
+        visitor.visit(AST.Addition(AST.Integer(1), AST.Multiplication(AST.Object("x"), AST.Integer(2))))
+        self.assertEqual(visitor.integers, [1, 2])
+
+    def test_dispatches_to_inherited_visit_methods(self):
+        visitor = IntegersCollector()
+        visitor.visit(AST.Assignment(AST.Object("x"), AST.Addition(AST.Object("y"), AST.Integer(3))))
+        self.assertEqual(visitor.names, ["x", "y"])
+        self.assertEqual(visitor.integers, [3])
+
+    def test_generic_visit_descends_into_case_actions(self):
+        parser = PyCoolParser(write_tables=False, optimize=False)
+        program = parser.parse("""
+            class Main {
+                main() : Int {
+                    case a of
+                        b : Int => c;
+                        d : String => 4;
+                    esac
+                };
+            };
+        """)
+        visitor = IntegersCollector()
+        visitor.visit(program)
+        self.assertEqual(visitor.names, ["a", "c"])
+        self.assertEqual(visitor.integers, [4])
+
+
+class TestConstants(unittest.TestCase):
+    def test_shares_small_integers_and_booleans(self):
+        self.assertIs(AST.Integer(5), AST.Integer(5))
+        self.assertIsNot(AST.Integer(1000), AST.Integer(1000))
+        self.assertIs(AST.Boolean(True), AST.TRUE)
+
+    def test_shares_only_exact_types(self):
+        self.assertIsNot(AST.Boolean(1), AST.TRUE)
+        self.assertIs(AST.TRUE.content, True)
+        self.assertIs(AST.Integer(True).content, True)
+        self.assertIs(AST.Integer(1).content, 1)
+        self.assertEqual(AST.Integer("5").content, "5")
+
+    def test_subclasses_get_their_own_nodes(self):
+        class Small(AST.Integer):
+            __slots__ = ()
+
+        self.assertIs(type(Small(5)), Small)
+        self.assertIs(type(AST.Integer(5)), AST.Integer)
+
+    def test_parsed_trees_can_be_copied_and_pickled(self):
+        path = os.path.join(os.path.dirname(__file__), os.pardir, "examples", "arith.cl")
+        with open(path) as source:
+            program = PyCoolParser(write_tables=False, optimize=False).parse(source.read())
+        self.assertEqual(str(copy.deepcopy(program)), str(program))
+        self.assertEqual(str(pickle.loads(pickle.dumps(program))), str(program))
+
+
+class TestIterTuple(unittest.TestCase):
+    def test_yields_fields(self):
+        node = AST.Assignment(AST.Object("x"), AST.Integer(1))
+        self.assertEqual(tuple(node.iter_tuple()), node.to_tuple())
+
+    def test_defers_to_overridden_to_tuple(self):
+        class Tagged(AST.Object):
+            __slots__ = ()
+
+            def to_tuple(self):
+                return ("class_name", "Tagged"), ("tag", "custom")
+
+        self.assertEqual(tuple(Tagged("x").iter_tuple()), (("class_name", "Tagged"), ("tag", "custom")))
+
+
+class TestRender(unittest.TestCase):
+    def test_renders_nodes_in_tuples(self):
+        node = AST.Block([AST.Object("x"), AST.String("a\n")])
+        self.assertEqual(AST.render(node), "Block(expr_list=(Object(name='x'), String(content='a\\n')))")
+
+    def test_renders_overridden_to_readable(self):
+        class Literal(AST.Integer):
+            __slots__ = ()
+
+            def to_readable(self):
+                return "LIT"
+
+        self.assertEqual(str(Literal(1000)), "LIT")
+        addition = AST.Addition(Literal(1000), AST.Integer(2))
+        self.assertEqual(str(addition), "Addition(first=LIT, second=Integer(content=2))")
+
+    def test_renders_deeply_nested_trees(self):
+        depth = 50000
+        node = AST.Integer(0)
+        for _ in range(depth):
+            node = AST.Addition(node, AST.Integer(1))
+        rendered = AST.render(node)
+        self.assertEqual(str(node), rendered)
+        self.assertTrue(rendered.startswith("Addition(first=" * depth + "Integer(content=0), second="))
+        self.assertEqual(rendered.count("Integer(content=1)"), depth)
+
+
+class TestWalk(unittest.TestCase):
+    def test_yields_nodes_in_pre_order(self):
+        x, one, two = AST.Object("x"), AST.Integer(1), AST.Integer(2)
+        product = AST.Multiplication(one, two)
+        addition = AST.Addition(x, product)
+        self.assertEqual(list(AST.walk(addition)), [addition, x, product, one, two])
+
+    def test_yields_nodes_nested_in_tuples(self):
+        body, expr = AST.Integer(7), AST.Object("a")
+        case = AST.Case(expr, [("b", "Int", body)])
+        self.assertEqual(list(AST.walk(case)), [case, expr, body])
+
+
+if __name__ == "__main__":
+    unittest.main()
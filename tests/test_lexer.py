@@ -0,0 +1,116 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from pycoolc.lexer import PyCoolLexer
+
+
+class LexerTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.lexer = PyCoolLexer(optimize=False)
+
+    def tokenize(self, source):
+        self.lexer.input(source)
+        return [(token.type, token.value) for token in self.lexer]
+
+
+class TestKeywordBoundaries(LexerTestCase):
+    def test_not(self):
+        self.assertEqual(self.tokenize("not x"), [("NOT", "not"), ("ID", "x")])
+
+    def test_not_followed_by_parenthesis(self):
+        self.assertEqual(self.tokenize("not(x)"), [("NOT", "not"), ("LPAREN", "("), ("ID", "x"), ("RPAREN", ")")])
+
+    def test_identifier_starting_with_not(self):
+        self.assertEqual(self.tokenize("nothing"), [("ID", "nothing")])
+
+    def test_identifiers_starting_with_true(self):
+        self.assertEqual(self.tokenize("true_"), [("ID", "true_")])
+        self.assertEqual(self.tokenize("trueish"), [("ID", "trueish")])
+
+    def test_booleans(self):
+        self.assertEqual(self.tokenize("true false"), [("BOOLEAN", True), ("BOOLEAN", False)])
+        self.assertEqual(self.tokenize("false;"), [("BOOLEAN", False), ("SEMICOLON", ";")])
+
+
+class TestStrings(LexerTestCase):
+    def test_escape_sequence(self):
+        self.assertEqual(self.tokenize(r'"a\tb"'), [("STRING", "a\tb")])
+
+    def test_escaped_plain_character(self):
+        self.assertEqual(self.tokenize(r'"\qx"'), [("STRING", "qx")])
+
+    def test_escaped_quote(self):
+        self.assertEqual(self.tokenize(r'"\"x"'), [("STRING", '"x')])
+
+    def test_escaped_backslash(self):
+        self.assertEqual(self.tokenize(r'"a\\"'), [("STRING", "a\\")])
+        self.assertEqual(self.tokenize(r'"a\\\tb"'), [("STRING", "a\\\tb")])
+
+    def test_escaped_newline(self):
+        self.assertEqual(self.tokenize('"a\\\nb" x'), [("STRING", "ab"), ("ID", "x")])
+
+
+class TestComments(LexerTestCase):
+    def test_nested_comments(self):
+        self.assertEqual(self.tokenize("(* a (* b *) c *) x"), [("ID", "x")])
+
+    def test_comment_start_is_not_an_end(self):
+        self.assertEqual(self.tokenize("(*) y *) z"), [("ID", "z")])
+
+    def test_stars_inside_comment(self):
+        self.assertEqual(self.tokenize("(* a ** b **) x"), [("ID", "x")])
+        self.assertEqual(self.tokenize("(* a *) * x"), [("MULTIPLY", "*"), ("ID", "x")])
+
+
+class TestLextab(unittest.TestCase):
+    def setUp(self):
+        self.outputdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.outputdir.cleanup)
+        sys.path.insert(0, self.outputdir.name)
+        self.addCleanup(sys.path.remove, self.outputdir.name)
+        self.lextab = "lextab_" + self.id().rpartition(".")[2]
+        self.addCleanup(sys.modules.pop, self.lextab, None)
+        self.path = os.path.join(self.outputdir.name, self.lextab + ".py")
+
+    def build(self):
+        lexer = PyCoolLexer(lextab=self.lextab, outputdir=self.outputdir.name)
+        lexer.input("not x")
+        self.assertEqual([token.type for token in lexer], ["NOT", "ID"])
+
+    def read(self):
+        with open(self.path) as lextab_file:
+            return lextab_file.read()
+
+    def write(self, source):
+        with open(self.path, "w") as lextab_file:
+            lextab_file.write(source)
+
+    def test_stale_lextab_is_regenerated(self):
+        self.write("_tabversion = '3.8'\n_lexsignature = '0123abcd'\n")
+        self.build()
+        self.assertIn("_lexstateinfo", self.read())
+        self.assertNotIn("0123abcd", self.read())
+
+    def test_signed_lextab_is_reused(self):
+        self.build()
+        self.write(self.read() + "# reused\n")
+        sys.modules.pop(self.lextab, None)
+        self.build()
+        self.assertTrue(self.read().endswith("# reused\n"))
+
+    def test_foreign_module_is_left_alone(self):
+        self.write("FOREIGN = True\n")
+        self.build()
+        self.assertEqual(self.read(), "FOREIGN = True\n")
+
+    def test_unwritable_lextab_is_skipped(self):
+        lexer = PyCoolLexer(lextab=self.lextab, outputdir=os.path.join(self.outputdir.name, "missing"))
+        lexer.input("not x")
+        self.assertEqual([token.type for token in lexer], ["NOT", "ID"])
+
+
+if __name__ == "__main__":
+    unittest.main()